@@ -2,9 +2,9 @@
 REST API для User Service
 """
 
-from typing import Any, Dict
+from typing import Any, Dict, Tuple
 
-from flask import Flask, jsonify, request
+from flask import Flask, Response, jsonify, request
 
 from app.user_service import UserRepository, ValidationError
 
@@ -38,6 +38,12 @@ def get_users() -> Dict[str, Any]:
     )
 
 
+@app.route("/users/stats", methods=["GET"])
+def get_users_stats() -> Tuple[Response, int]:
+    """Агрегированная статистика по пользователям"""
+    return jsonify(repository.stats()), 200
+
+
 @app.route("/users/<int:user_id>", methods=["GET"])
 def get_user(user_id: int) -> Dict[str, Any]:
     """Получение пользователя по ID"""
@@ -0,0 +1,713 @@
+"""
+Генератор нагрузки и синтетических данных для планирования мощностей
+
+Примеры:
+    python -m app.loadgen --users 1000 --rate 200 --duration 10
+    python -m app.loadgen --url http://localhost:5000 --rate 500 --json
+    python -m app.loadgen --url http://localhost:5000 --pid 12345
+"""
+
+import argparse
+import http.client
+import itertools
+import json
+import math
+import random
+import sys
+import threading
+import time
+import tracemalloc
+import urllib.parse
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from app.user_service import UserRepository
+
+METHODS = ("GET", "POST", "PUT", "DELETE")
+DEFAULT_MIX = "GET=70,POST=10,PUT=10,DELETE=10"
+EMAIL_DOMAINS = ("example.com", "example.org", "test.io", "mail.net")
+# Прогрев заполняет ленивые импорты и LRU-кэши путей (до 128 записей
+# в werkzeug и urllib.parse), чтобы они не выглядели как рост памяти
+WARMUP_REQUESTS = 256
+
+Payload = Optional[Dict[str, Any]]
+
+# Аллокации самого генератора (списки латентностей, очередь и futures
+# пула потоков, снимки tracemalloc) не относятся к памяти приложения
+MEMORY_EXCLUDE_FILTERS = (
+    tracemalloc.Filter(False, __file__),
+    tracemalloc.Filter(False, "*/concurrent/futures/*"),
+    tracemalloc.Filter(False, "*/threading.py"),
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, "<unknown>"),
+)
+
+
+def synthetic_user(index: int, prefix: str = "user") -> Dict[str, str]:
+    """
+    Генерация валидных данных пользователя
+
+    Args:
+        index: Порядковый номер (определяет уникальность email)
+        prefix: Префикс имени и email
+
+    Returns:
+        Словарь с полями username и email
+    """
+    domain = EMAIL_DOMAINS[index % len(EMAIL_DOMAINS)]
+    return {"username": f"{prefix}{index:06d}", "email": f"{prefix}{index}@{domain}"}
+
+
+def seed_repository(
+    repository: UserRepository, count: int, prefix: str = "user"
+) -> List[int]:
+    """
+    Наполнение репозитория синтетическими пользователями
+
+    Args:
+        repository: Репозиторий для наполнения
+        count: Количество пользователей
+        prefix: Префикс имени и email
+
+    Returns:
+        Список ID созданных пользователей
+    """
+    return [
+        repository.create(**synthetic_user(index, prefix)).user_id
+        for index in range(1, count + 1)
+    ]
+
+
+def parse_mix(spec: str) -> Dict[str, float]:
+    """
+    Разбор смеси запросов вида "GET=70,POST=10,PUT=10,DELETE=10"
+
+    Args:
+        spec: Строка со смесью запросов
+
+    Returns:
+        Доли методов, нормированные к 1
+
+    Raises:
+        ValueError: Если смесь задана некорректно
+    """
+    weights: Dict[str, float] = {}
+    for part in spec.split(","):
+        method, _, raw_weight = part.partition("=")
+        method = method.strip().upper()
+        if method not in METHODS:
+            raise ValueError(f"Неизвестный метод в смеси: {method!r}")
+        if method in weights:
+            raise ValueError(f"Метод {method} указан в смеси повторно")
+        weight = float(raw_weight)
+        if not math.isfinite(weight):
+            raise ValueError(f"Вес метода {method} должен быть конечным числом")
+        if weight < 0:
+            raise ValueError(f"Вес метода {method} не может быть отрицательным")
+        weights[method] = weight
+
+    total = sum(weights.values())
+    if total <= 0:
+        raise ValueError("Сумма весов смеси должна быть положительной")
+    return {method: weight / total for method, weight in weights.items()}
+
+
+def percentile(values: List[float], percent: float) -> float:
+    """
+    Перцентиль по методу ближайшего ранга
+
+    Args:
+        values: Отсортированные значения
+        percent: Перцентиль от 0 до 100
+
+    Returns:
+        Значение перцентиля или 0.0 для пустого списка
+    """
+    if not values:
+        return 0.0
+    rank = max(1, math.ceil(percent / 100 * len(values)))
+    return values[rank - 1]
+
+
+class FlaskClientTarget:
+    """Цель нагрузки: Flask test client в том же процессе"""
+
+    name = "in-process"
+
+    def __init__(self) -> None:
+        """Инициализация тестового клиента"""
+        # Импорт здесь, чтобы HTTP-режим не создавал приложение
+        from app.api import app, repository  # pylint: disable=import-outside-toplevel
+
+        self.repository = repository
+        self._client = app.test_client()
+        # Запросы сериализуются: репозиторий не потокобезопасен,
+        # ожидание блокировки попадает в латентность как очередь сервера
+        self._lock = threading.Lock()
+
+    def request(
+        self, method: str, path: str, payload: Payload = None
+    ) -> Tuple[int, Any]:
+        """
+        Выполнение запроса
+
+        Args:
+            method: HTTP метод
+            path: Путь запроса
+            payload: JSON тело (опционально)
+
+        Returns:
+            HTTP статус и разобранный JSON ответа
+        """
+        with self._lock:
+            response = self._client.open(path, method=method, json=payload)
+        return response.status_code, response.get_json(silent=True)
+
+    def seed(self, count: int, prefix: str) -> List[int]:
+        """
+        Наполнение репозитория напрямую, минуя HTTP
+
+        Args:
+            count: Количество пользователей
+            prefix: Префикс имени и email
+
+        Returns:
+            Список ID созданных пользователей
+        """
+        with self._lock:
+            return seed_repository(self.repository, count, prefix)
+
+    @staticmethod
+    def memory_bytes() -> Optional[int]:
+        """
+        Объем памяти Python-кучи, занятой приложением
+
+        Аллокации генератора нагрузки исключаются (MEMORY_EXCLUDE_FILTERS).
+
+        Returns:
+            Байты по данным tracemalloc или None, если трассировка выключена
+        """
+        if not tracemalloc.is_tracing():
+            return None
+        snapshot = tracemalloc.take_snapshot().filter_traces(MEMORY_EXCLUDE_FILTERS)
+        return sum(stat.size for stat in snapshot.statistics("filename"))
+
+
+class HttpTarget:
+    """Цель нагрузки: запущенный сервер по HTTP"""
+
+    name = "http"
+
+    def __init__(
+        self, base_url: str, timeout: float = 10.0, pid: Optional[int] = None
+    ) -> None:
+        """
+        Инициализация HTTP-цели
+
+        Args:
+            base_url: Адрес сервера, например http://localhost:5000
+            timeout: Таймаут запроса в секундах
+            pid: PID процесса сервера для чтения RSS (опционально)
+        """
+        parsed = urllib.parse.urlsplit(base_url)
+        if parsed.scheme not in ("http", "https") or not parsed.netloc:
+            raise ValueError("URL должен начинаться с http:// или https://")
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self.pid = pid
+        self._netloc = parsed.netloc
+        self._base_path = parsed.path.rstrip("/")
+        self._connection_class = (
+            http.client.HTTPSConnection
+            if parsed.scheme == "https"
+            else http.client.HTTPConnection
+        )
+        # Одно постоянное соединение на поток: без рукопожатия TCP на каждый
+        # запрос и без накопления сокетов в TIME_WAIT
+        self._local = threading.local()
+
+    def _connection(self) -> Tuple[http.client.HTTPConnection, bool]:
+        """
+        Постоянное соединение текущего потока
+
+        Returns:
+            Соединение и признак того, что оно уже использовалось
+        """
+        connection = getattr(self._local, "connection", None)
+        if connection is not None:
+            return connection, True
+        connection = self._connection_class(self._netloc, timeout=self.timeout)
+        self._local.connection = connection
+        return connection, False
+
+    def _reset_connection(self) -> None:
+        """Закрытие соединения текущего потока"""
+        connection = getattr(self._local, "connection", None)
+        if connection is not None:
+            connection.close()
+            self._local.connection = None
+
+    def request(
+        self, method: str, path: str, payload: Payload = None
+    ) -> Tuple[int, Any]:
+        """
+        Выполнение запроса
+
+        Args:
+            method: HTTP метод
+            path: Путь запроса
+            payload: JSON тело (опционально)
+
+        Returns:
+            HTTP статус (0 при ошибке соединения) и разобранный JSON ответа
+        """
+        data = json.dumps(payload).encode() if payload is not None else None
+        headers = {"Content-Type": "application/json"} if data is not None else {}
+        while True:
+            connection, reused = self._connection()
+            try:
+                connection.request(
+                    method, self._base_path + path, body=data, headers=headers
+                )
+                response = connection.getresponse()
+                status, raw = response.status, response.read()
+                break
+            except (http.client.HTTPException, OSError):
+                self._reset_connection()
+                # Сервер мог закрыть простаивающее соединение: один повтор
+                if not reused:
+                    return 0, None
+
+        if response.will_close:
+            self._reset_connection()
+        if status >= 400:
+            return status, None
+        try:
+            return status, json.loads(raw or b"null")
+        except ValueError:
+            return status, None
+
+    def seed(self, count: int, prefix: str) -> List[int]:
+        """
+        Наполнение сервера через POST /users
+
+        Args:
+            count: Количество пользователей
+            prefix: Префикс имени и email
+
+        Returns:
+            Список ID созданных пользователей
+        """
+        ids = []
+        for index in range(1, count + 1):
+            status, body = self.request("POST", "/users", synthetic_user(index, prefix))
+            if status == 201 and body:
+                ids.append(body["user_id"])
+        return ids
+
+    def memory_bytes(self) -> Optional[int]:
+        """
+        Резидентная память (RSS) процесса сервера
+
+        Returns:
+            Байты по VmRSS из /proc/<pid>/status или None,
+            если PID не задан или процесс недоступен
+        """
+        if self.pid is None:
+            return None
+        try:
+            with open(f"/proc/{self.pid}/status", encoding="ascii") as status:
+                for line in status:
+                    if line.startswith("VmRSS:"):
+                        return int(line.split()[1]) * 1024
+        except (OSError, ValueError, IndexError):
+            return None
+        return None
+
+
+Target = Union[FlaskClientTarget, HttpTarget]
+
+
+class LoadGenerator:
+    """
+    Генератор нагрузки с открытой моделью поступления запросов
+
+    Запросы приходят пуассоновским потоком с заданной интенсивностью
+    независимо от скорости ответов, а латентность считается от
+    запланированного момента отправки. Так очередь на перегруженном
+    сервере видна в перцентилях, а не маскируется замедлением клиента.
+    """
+
+    def __init__(
+        self,
+        target: Target,
+        rate: float,
+        duration: float,
+        mix: Optional[Dict[str, float]] = None,
+        workers: int = 32,
+        sample_interval: float = 1.0,
+    ) -> None:
+        """
+        Инициализация генератора
+
+        Args:
+            target: Цель нагрузки
+            rate: Интенсивность запросов в секунду
+            duration: Длительность подачи нагрузки в секундах
+            mix: Доли методов (по умолчанию DEFAULT_MIX)
+            workers: Количество потоков, выполняющих запросы
+            sample_interval: Период снятия временного ряда в секундах
+        """
+        if rate <= 0 or duration <= 0 or workers <= 0 or sample_interval <= 0:
+            raise ValueError("rate, duration, workers и interval должны быть > 0")
+
+        self.target = target
+        self.rate = rate
+        self.duration = duration
+        self.mix = mix or parse_mix(DEFAULT_MIX)
+        self.workers = workers
+        self.sample_interval = sample_interval
+
+        self._rng = random.Random()  # nosec B311 - не криптография
+        self._prefix = f"lg{self._rng.getrandbits(32):08x}u"
+        self._index = itertools.count(1)
+        self._ids: List[int] = []
+        self._ids_lock = threading.Lock()
+        self._latencies: Dict[str, List[float]] = {method: [] for method in METHODS}
+        self._statuses: Dict[str, int] = {}
+        self._results_lock = threading.Lock()
+        self._completed = 0
+
+    def seed(self, count: int) -> int:
+        """
+        Наполнение цели синтетическими пользователями
+
+        Args:
+            count: Количество пользователей
+
+        Returns:
+            Количество созданных пользователей
+        """
+        ids = self.target.seed(count, self._prefix + "s")
+        with self._ids_lock:
+            self._ids.extend(ids)
+        return len(ids)
+
+    def _next_request(self) -> Tuple[str, str, Payload]:
+        """
+        Выбор следующего запроса по смеси
+
+        Returns:
+            Метод, путь и тело запроса
+        """
+        methods = list(self.mix)
+        method = self._rng.choices(methods, weights=[self.mix[m] for m in methods])[0]
+
+        user_id = 0
+        with self._ids_lock:
+            if method != "POST" and self._ids:
+                position = self._rng.randrange(len(self._ids))
+                user_id = self._ids[position]
+                if method == "DELETE":
+                    # Удаляем из пула сразу, чтобы не выбрать ID повторно
+                    self._ids[position] = self._ids[-1]
+                    self._ids.pop()
+            elif method != "POST":
+                method = "POST"
+
+        if method == "POST":
+            return method, "/users", synthetic_user(next(self._index), self._prefix)
+        if method == "PUT":
+            payload = {"username": f"{self._prefix}{next(self._index):06d}"}
+            return method, f"/users/{user_id}", payload
+        return method, f"/users/{user_id}", None
+
+    def _execute(
+        self, method: str, path: str, payload: Payload, scheduled: float
+    ) -> None:
+        """
+        Выполнение запроса и учет результата
+
+        Args:
+            method: HTTP метод
+            path: Путь запроса
+            payload: JSON тело
+            scheduled: Запланированный момент отправки (perf_counter)
+        """
+        try:
+            status, body = self.target.request(method, path, payload)
+            if method == "POST" and status == 201:
+                user_id = body["user_id"]
+                with self._ids_lock:
+                    self._ids.append(user_id)
+            status_class = f"{status // 100}xx" if status else "error"
+        except Exception:  # pylint: disable=broad-except
+            # Future из пула не проверяется: любой сбой должен попасть в отчет
+            status_class = "error"
+        latency = time.perf_counter() - scheduled
+
+        with self._results_lock:
+            self._latencies[method].append(latency)
+            self._statuses[status_class] = self._statuses.get(status_class, 0) + 1
+            self._completed += 1
+
+    def _warm_up(self) -> None:
+        """
+        Прогрев цели GET-запросами, не попадающими в отчет
+
+        Нужен только для чистой базовой линии памяти; при первой
+        ошибке соединения прекращается, чтобы не ждать таймаутов.
+        """
+        for user_id in range(1, WARMUP_REQUESTS + 1):
+            try:
+                status, _ = self.target.request("GET", f"/users/{user_id}")
+            except Exception:  # pylint: disable=broad-except
+                return
+            if not status:
+                return
+
+    def _sample(self, start: float, stop: threading.Event) -> List[Dict[str, Any]]:
+        """
+        Снятие временного ряда до сигнала остановки
+
+        Args:
+            start: Момент начала нагрузки (perf_counter)
+            stop: Событие остановки
+
+        Returns:
+            Временной ряд пропускной способности и памяти
+        """
+        timeline = []
+        last_time, last_completed = start, 0
+        while True:
+            stopped = stop.wait(self.sample_interval)
+            now = time.perf_counter()
+            with self._results_lock:
+                completed = self._completed
+            timeline.append(
+                {
+                    "t": round(now - start, 3),
+                    "completed": completed,
+                    "throughput_rps": round(
+                        (completed - last_completed) / max(now - last_time, 1e-9), 2
+                    ),
+                    "memory_bytes": self.target.memory_bytes(),
+                }
+            )
+            last_time, last_completed = now, completed
+            if stopped:
+                return timeline
+
+    def run(self) -> Dict[str, Any]:
+        """
+        Подача нагрузки и сбор отчета
+
+        Returns:
+            Отчет с пропускной способностью, перцентилями и памятью
+        """
+        if self.target.memory_bytes() is not None:
+            self._warm_up()
+        memory_before = self.target.memory_bytes()
+        timeline: List[Dict[str, Any]] = []
+        stop = threading.Event()
+        start = time.perf_counter()
+        sampler = threading.Thread(
+            target=lambda: timeline.extend(self._sample(start, stop)), daemon=True
+        )
+        sampler.start()
+
+        scheduled = start
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            while True:
+                scheduled += self._rng.expovariate(self.rate)
+                if scheduled - start >= self.duration:
+                    break
+                delay = scheduled - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+                executor.submit(self._execute, *self._next_request(), scheduled)
+
+        elapsed = time.perf_counter() - start
+        stop.set()
+        sampler.join()
+        return self._report(elapsed, memory_before, timeline)
+
+    def _report(
+        self,
+        elapsed: float,
+        memory_before: Optional[int],
+        timeline: List[Dict[str, Any]],
+    ) -> Dict[str, Any]:
+        """
+        Формирование отчета
+
+        Args:
+            elapsed: Время от начала нагрузки до последнего ответа
+            memory_before: Память до начала нагрузки
+            timeline: Временной ряд
+
+        Returns:
+            Отчет в виде словаря
+        """
+        all_latencies = sorted(itertools.chain(*self._latencies.values()))
+        memory_after = self.target.memory_bytes()
+        memory_growth = None
+        if memory_before is not None and memory_after is not None:
+            memory_growth = memory_after - memory_before
+
+        return {
+            "target": self.target.name,
+            "offered_rate_rps": self.rate,
+            "duration_s": round(elapsed, 3),
+            "requests": len(all_latencies),
+            "throughput_rps": round(len(all_latencies) / elapsed, 2),
+            "statuses": dict(sorted(self._statuses.items())),
+            "latency_ms": _latency_summary(all_latencies),
+            "by_method": {
+                method: {
+                    "count": len(values),
+                    **_latency_summary(sorted(values)),
+                }
+                for method, values in self._latencies.items()
+                if values
+            },
+            "memory_tracing": tracemalloc.is_tracing(),
+            "memory_before_bytes": memory_before,
+            "memory_growth_bytes": memory_growth,
+            "timeline": timeline,
+        }
+
+
+def _latency_summary(latencies: List[float]) -> Dict[str, float]:
+    """
+    Перцентили латентности в миллисекундах
+
+    Args:
+        latencies: Отсортированные латентности в секундах
+
+    Returns:
+        Словарь p50/p90/p99/max
+    """
+    return {
+        "p50": round(percentile(latencies, 50) * 1000, 3),
+        "p90": round(percentile(latencies, 90) * 1000, 3),
+        "p99": round(percentile(latencies, 99) * 1000, 3),
+        "max": round((latencies[-1] if latencies else 0.0) * 1000, 3),
+    }
+
+
+def format_report(report: Dict[str, Any]) -> str:
+    """
+    Текстовое представление отчета
+
+    Args:
+        report: Отчет LoadGenerator.run()
+
+    Returns:
+        Многострочный текст
+    """
+    latency = report["latency_ms"]
+    lines = [
+        f"target:     {report['target']}",
+        f"offered:    {report['offered_rate_rps']} rps",
+        f"achieved:   {report['throughput_rps']} rps "
+        f"({report['requests']} requests in {report['duration_s']} s)",
+        f"statuses:   {report['statuses']}",
+        f"latency ms: p50={latency['p50']} p90={latency['p90']} "
+        f"p99={latency['p99']} max={latency['max']}",
+    ]
+    for method, stats in report["by_method"].items():
+        lines.append(
+            f"  {method:<6} n={stats['count']} p50={stats['p50']} p99={stats['p99']}"
+        )
+    if report["memory_tracing"]:
+        lines.append("warning:    tracemalloc включен, латентность и rps занижены")
+    if report["memory_growth_bytes"] is not None:
+        lines.append(f"memory:     {report['memory_growth_bytes']:+d} bytes")
+    lines.append("timeline:")
+    for point in report["timeline"]:
+        memory = point["memory_bytes"]
+        lines.append(
+            f"  t={point['t']:>8.3f}s  {point['throughput_rps']:>10.2f} rps"
+            + (f"  {memory} bytes" if memory is not None else "")
+        )
+    return "\n".join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Точка входа CLI
+
+    Args:
+        argv: Аргументы командной строки
+
+    Returns:
+        Код возврата
+    """
+    parser = argparse.ArgumentParser(
+        prog="python -m app.loadgen",
+        description="Нагрузочный тест User API с открытой моделью поступления",
+    )
+    parser.add_argument("--url", help="Адрес сервера; без него — Flask test client")
+    parser.add_argument(
+        "--users", type=int, default=0, help="Синтетических пользователей"
+    )
+    parser.add_argument("--rate", type=float, default=100.0, help="Запросов в секунду")
+    parser.add_argument("--duration", type=float, default=10.0, help="Секунд нагрузки")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help="Смесь методов")
+    parser.add_argument("--workers", type=int, default=32, help="Потоков-исполнителей")
+    parser.add_argument("--interval", type=float, default=1.0, help="Период выборки, с")
+    parser.add_argument(
+        "--memory",
+        action="store_true",
+        help="Отслеживать память приложения через tracemalloc (только in-process); "
+        "замедляет запросы, латентность и rps в таком прогоне недостоверны",
+    )
+    parser.add_argument(
+        "--pid",
+        type=int,
+        help="PID сервера для --url: RSS из /proc/<pid>/status на каждом шаге выборки",
+    )
+    parser.add_argument("--json", action="store_true", help="Вывести отчет в JSON")
+    args = parser.parse_args(argv)
+    if args.pid is not None and not args.url:
+        parser.error("--pid используется только вместе с --url")
+
+    try:
+        target: Target
+        if args.url:
+            target = HttpTarget(args.url, pid=args.pid)
+        else:
+            target = FlaskClientTarget()
+        generator = LoadGenerator(
+            target,
+            rate=args.rate,
+            duration=args.duration,
+            mix=parse_mix(args.mix),
+            workers=args.workers,
+            sample_interval=args.interval,
+        )
+    except ValueError as e:
+        parser.error(str(e))
+
+    tracing = args.memory and not args.url
+    if tracing:
+        tracemalloc.start()
+    try:
+        seeded = generator.seed(args.users)
+        report = generator.run()
+    finally:
+        if tracing:
+            tracemalloc.stop()
+    report["seeded_users"] = seeded
+
+    if args.json:
+        print(json.dumps(report, ensure_ascii=False, indent=2))
+    else:
+        print(f"seeded:     {seeded} users")
+        print(format_report(report))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
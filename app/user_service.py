@@ -93,6 +93,66 @@ class UserRepository:
         """Инициализация репозитория"""
         self._users: Dict[int, User] = {}
         self._next_id: int = 1
+        # Индекс email -> user_id для проверки уникальности за O(1)
+        self._email_index: Dict[str, int] = {}
+        # Агрегаты поддерживаются инкрементально в create/update/delete
+        self._domain_counts: Dict[str, int] = {}
+        self._created_counts: Dict[str, int] = {}
+
+    @staticmethod
+    def _email_domain(email: str) -> str:
+        """
+        Извлечение домена из email
+
+        Args:
+            email: Email адрес
+
+        Returns:
+            Домен в нижнем регистре
+        """
+        return email.rsplit("@", 1)[-1].lower()
+
+    @staticmethod
+    def _created_bucket(created_at: datetime) -> str:
+        """
+        Ключ корзины гистограммы created_at (день)
+
+        Args:
+            created_at: Дата создания
+
+        Returns:
+            Дата в формате YYYY-MM-DD
+        """
+        return created_at.date().isoformat()
+
+    @staticmethod
+    def _increment(counters: Dict[str, int], key: str, delta: int) -> None:
+        """
+        Изменение счетчика с удалением обнулившихся ключей
+
+        Args:
+            counters: Словарь счетчиков
+            key: Ключ счетчика
+            delta: Приращение
+        """
+        value = counters.get(key, 0) + delta
+        if value > 0:
+            counters[key] = value
+        else:
+            counters.pop(key, None)
+
+    def _track(self, user: User, delta: int) -> None:
+        """
+        Учет пользователя в агрегатах
+
+        Args:
+            user: Пользователь
+            delta: +1 при добавлении, -1 при удалении
+        """
+        self._increment(self._domain_counts, self._email_domain(user.email), delta)
+        self._increment(
+            self._created_counts, self._created_bucket(user.created_at), delta
+        )
 
     def create(self, username: str, email: str) -> User:
         """
@@ -115,7 +175,9 @@ class UserRepository:
         user = User(user_id=self._next_id, username=username, email=email)
 
         self._users[user.user_id] = user
+        self._email_index[user.email] = user.user_id
         self._next_id += 1
+        self._track(user, 1)
 
         return user
 
@@ -141,10 +203,8 @@ class UserRepository:
         Returns:
             Пользователь или None
         """
-        for user in self._users.values():
-            if user.email == email:
-                return user
-        return None
+        user_id = self._email_index.get(email)
+        return self._users.get(user_id) if user_id is not None else None
 
     def get_all(self) -> List[User]:
         """
@@ -190,6 +250,10 @@ class UserRepository:
         )
 
         self._users[user_id] = updated_user
+        del self._email_index[user.email]
+        self._email_index[updated_user.email] = user_id
+        self._track(user, -1)
+        self._track(updated_user, 1)
         return updated_user
 
     def delete(self, user_id: int) -> bool:
@@ -202,10 +266,12 @@ class UserRepository:
         Returns:
             True если пользователь был удален
         """
-        if user_id in self._users:
-            del self._users[user_id]
-            return True
-        return False
+        user = self._users.pop(user_id, None)
+        if user is None:
+            return False
+        del self._email_index[user.email]
+        self._track(user, -1)
+        return True
 
     def count(self) -> int:
         """
@@ -215,3 +281,27 @@ class UserRepository:
             Количество пользователей
         """
         return len(self._users)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Агрегированная статистика по пользователям
+
+        Считается по инкрементальным счетчикам, без обхода пользователей.
+
+        Returns:
+            Общее количество, распределение по доменам email
+            и гистограмма регистраций по дням
+        """
+        return {
+            "total": len(self._users),
+            "by_email_domain": dict(sorted(self._domain_counts.items())),
+            "created_per_day": dict(sorted(self._created_counts.items())),
+        }
+
+    def clear(self) -> None:
+        """Удаление всех пользователей и сброс счетчиков"""
+        self._users.clear()
+        self._next_id = 1
+        self._email_index.clear()
+        self._domain_counts.clear()
+        self._created_counts.clear()
@@ -13,8 +13,7 @@ from app.api import app, repository  # <-- Импортируем и app, и rep
 def client():
     """Фикстура для тестового клиента"""
     # Очищаем репозиторий ПЕРЕД созданием клиента
-    repository._users.clear()
-    repository._next_id = 1
+    repository.clear()
 
     app.config["TESTING"] = True
 
@@ -188,3 +187,28 @@ class TestUsersEndpoints:
         data = json.loads(response.data)
         assert data["count"] == 2
         assert len(data["users"]) == 2
+
+
+class TestStatsEndpoint:
+    """Тесты для stats endpoint"""
+
+    def test_stats(self, client):
+        """Тест получения статистики пользователей"""
+        client.post(
+            "/users",
+            data=json.dumps({"username": "user1", "email": "user1@example.com"}),
+            content_type="application/json",
+        )
+        client.post(
+            "/users",
+            data=json.dumps({"username": "user2", "email": "user2@test.org"}),
+            content_type="application/json",
+        )
+
+        response = client.get("/users/stats")
+        assert response.status_code == 200
+
+        data = json.loads(response.data)
+        assert data["total"] == 2
+        assert data["by_email_domain"] == {"example.com": 1, "test.org": 1}
+        assert sum(data["created_per_day"].values()) == 2
@@ -0,0 +1,418 @@
+"""
+Тесты для генератора нагрузки
+"""
+
+import http.client
+import json
+import os
+import threading
+import tracemalloc
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from werkzeug.serving import make_server
+
+from app.api import app, repository
+from app.loadgen import (
+    FlaskClientTarget,
+    HttpTarget,
+    LoadGenerator,
+    format_report,
+    main,
+    parse_mix,
+    percentile,
+    seed_repository,
+    synthetic_user,
+)
+from app.user_service import User, UserRepository
+
+
+@pytest.fixture
+def clean_repository():
+    """Фикстура, очищающая репозиторий API"""
+    repository.clear()
+    yield repository
+    repository.clear()
+
+
+@pytest.fixture
+def tracing():
+    """Фикстура, включающая tracemalloc на время теста"""
+    tracemalloc.start()
+    yield
+    tracemalloc.stop()
+
+
+class StubTarget:
+    """Цель-заглушка, записывающая запросы"""
+
+    name = "stub"
+
+    def __init__(self, status=200, memory=None):
+        """Инициализация с фиксированным статусом и памятью"""
+        self.status = status
+        self.memory = memory
+        self.calls = []
+
+    def request(self, method, path, payload=None):
+        """Запрос, возвращающий фиксированный статус"""
+        self.calls.append((method, path))
+        return self.status, None
+
+    def seed(self, count, prefix):
+        """Наполнение не поддерживается"""
+        return []
+
+    def memory_bytes(self):
+        """Фиксированный объем памяти"""
+        return self.memory
+
+
+class RaisingTarget(StubTarget):
+    """Цель, запросы к которой выбрасывают исключение"""
+
+    def __init__(self, error):
+        """Инициализация с исключением"""
+        super().__init__()
+        self.error = error
+
+    def request(self, method, path, payload=None):
+        """Запрос, выбрасывающий исключение"""
+        raise self.error
+
+
+class MalformedBodyTarget(StubTarget):
+    """Цель, отвечающая на POST статусом 201 с телом не-dict"""
+
+    def request(self, method, path, payload=None):
+        """Запрос с некорректным телом ответа"""
+        return 201, "not a dict"
+
+
+@pytest.fixture
+def server(clean_repository):
+    """Фикстура с запущенным HTTP сервером"""
+    http_server = make_server("127.0.0.1", 0, app, threaded=True)
+    thread = threading.Thread(
+        target=http_server.serve_forever, args=(0.05,), daemon=True
+    )
+    thread.start()
+    yield f"http://127.0.0.1:{http_server.server_port}"
+    http_server.shutdown()
+
+
+class KeepAliveHandler(BaseHTTPRequestHandler):
+    """HTTP/1.1 обработчик с keep-alive, считающий соединения"""
+
+    protocol_version = "HTTP/1.1"
+    connections = 0
+
+    def setup(self):
+        """Учет нового соединения"""
+        super().setup()
+        type(self).connections += 1
+
+    def do_GET(self):  # noqa: N802
+        """Ответ фиксированным JSON"""
+        body = b'{"status": "healthy"}'
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):  # noqa: A002
+        """Без логирования запросов"""
+
+
+@pytest.fixture
+def keep_alive_server():
+    """Фикстура с HTTP/1.1 сервером, поддерживающим keep-alive"""
+    KeepAliveHandler.connections = 0
+    http_server = ThreadingHTTPServer(("127.0.0.1", 0), KeepAliveHandler)
+    http_server.daemon_threads = True
+    thread = threading.Thread(
+        target=http_server.serve_forever, args=(0.05,), daemon=True
+    )
+    thread.start()
+    yield f"http://127.0.0.1:{http_server.server_port}"
+    http_server.shutdown()
+    http_server.server_close()
+
+
+class TestSyntheticData:
+    """Тесты для синтетических данных"""
+
+    def test_synthetic_user_is_valid(self):
+        """Тест валидности синтетического пользователя"""
+        for index in range(1, 10):
+            User(user_id=index, **synthetic_user(index))
+
+    def test_seed_repository(self):
+        """Тест наполнения репозитория"""
+        repo = UserRepository()
+
+        ids = seed_repository(repo, 50)
+
+        assert len(ids) == 50
+        assert repo.count() == 50
+        assert sum(repo.stats()["by_email_domain"].values()) == 50
+
+
+class TestHelpers:
+    """Тесты для вспомогательных функций"""
+
+    def test_parse_mix(self):
+        """Тест разбора смеси запросов"""
+        mix = parse_mix("get=3, POST=1")
+        assert mix == {"GET": 0.75, "POST": 0.25}
+
+    def test_parse_mix_invalid(self):
+        """Тест разбора некорректной смеси"""
+        with pytest.raises(ValueError, match="Неизвестный метод"):
+            parse_mix("PATCH=1")
+
+        with pytest.raises(ValueError, match="отрицательным"):
+            parse_mix("GET=-1")
+
+        with pytest.raises(ValueError, match="положительной"):
+            parse_mix("GET=0")
+
+    @pytest.mark.parametrize("spec", ["GET=nan", "GET=inf,POST=1", "GET=-inf"])
+    def test_parse_mix_non_finite(self, spec):
+        """Тест отказа от бесконечных и NaN весов"""
+        with pytest.raises(ValueError, match="конечным"):
+            parse_mix(spec)
+
+    def test_parse_mix_duplicate(self):
+        """Тест отказа от повторного метода"""
+        with pytest.raises(ValueError, match="повторно"):
+            parse_mix("GET=1,get=2")
+
+    def test_percentile(self):
+        """Тест вычисления перцентилей"""
+        values = [float(i) for i in range(1, 101)]
+
+        assert percentile(values, 50) == 50.0
+        assert percentile(values, 99) == 99.0
+        assert percentile(values, 0) == 1.0
+        assert percentile([], 50) == 0.0
+
+    def test_http_target_invalid_url(self):
+        """Тест отказа от URL без схемы http"""
+        with pytest.raises(ValueError, match="http://"):
+            HttpTarget("file:///etc/passwd")
+
+
+class TestLoadGenerator:
+    """Тесты для LoadGenerator"""
+
+    def test_invalid_arguments(self, clean_repository):
+        """Тест валидации параметров"""
+        with pytest.raises(ValueError):
+            LoadGenerator(FlaskClientTarget(), rate=0, duration=1)
+
+    def test_run_in_process(self, clean_repository):
+        """Тест нагрузки через Flask test client"""
+        generator = LoadGenerator(
+            FlaskClientTarget(), rate=200, duration=0.3, sample_interval=0.1
+        )
+
+        assert generator.seed(20) == 20
+        report = generator.run()
+
+        assert report["target"] == "in-process"
+        assert report["requests"] > 0
+        assert report["statuses"] == {"2xx": report["requests"]}
+        assert report["latency_ms"]["p50"] <= report["latency_ms"]["p99"]
+        assert report["timeline"]
+        assert "achieved" in format_report(report)
+
+    def test_run_http(self, server):
+        """Тест нагрузки на запущенный сервер"""
+        generator = LoadGenerator(
+            HttpTarget(server),
+            rate=100,
+            duration=0.3,
+            mix=parse_mix("GET=1,PUT=1,DELETE=1"),
+            sample_interval=0.1,
+        )
+
+        assert generator.seed(10) == 10
+        report = generator.run()
+
+        assert report["target"] == "http"
+        assert report["requests"] > 0
+        assert "error" not in report["statuses"]
+        assert report["memory_growth_bytes"] is None
+
+    def test_run_http_with_pid(self, server):
+        """Тест отслеживания RSS сервера по PID"""
+        generator = LoadGenerator(
+            HttpTarget(server, pid=os.getpid()),
+            rate=100,
+            duration=0.2,
+            sample_interval=0.1,
+        )
+
+        report = generator.run()
+
+        assert report["memory_before_bytes"] > 0
+        assert report["memory_growth_bytes"] is not None
+        assert report["memory_tracing"] is False
+        assert all(point["memory_bytes"] > 0 for point in report["timeline"])
+
+    @pytest.mark.parametrize(
+        "target",
+        [
+            RaisingTarget(http.client.IncompleteRead(b"")),
+            RaisingTarget(RuntimeError("boom")),
+            MalformedBodyTarget(),
+        ],
+        ids=["incomplete-read", "runtime-error", "malformed-body"],
+    )
+    def test_failed_requests_counted_as_errors(self, target):
+        """Тест учета сбоев запросов в статусе error"""
+        generator = LoadGenerator(
+            target,
+            rate=200,
+            duration=0.2,
+            mix=parse_mix("POST=1"),
+            sample_interval=0.1,
+        )
+
+        report = generator.run()
+
+        assert report["requests"] > 0
+        assert report["statuses"] == {"error": report["requests"]}
+
+    def test_memory_get_only_has_no_growth(self, clean_repository, tracing):
+        """Тест: память генератора не считается ростом памяти приложения"""
+        generator = LoadGenerator(
+            FlaskClientTarget(),
+            rate=1000,
+            duration=0.5,
+            mix=parse_mix("GET=1"),
+            sample_interval=1.0,
+        )
+        generator.seed(100)
+
+        report = generator.run()
+
+        assert report["requests"] >= 1
+        assert report["memory_tracing"] is True
+        assert report["memory_growth_bytes"] < 32 * 1024
+        assert "tracemalloc" in format_report(report)
+
+    def test_no_warm_up_without_memory(self):
+        """Тест: без отслеживания памяти прогрев не выполняется"""
+        target = StubTarget()
+        generator = LoadGenerator(
+            target, rate=100, duration=0.1, mix=parse_mix("POST=1")
+        )
+
+        generator.run()
+
+        assert all(method == "POST" for method, _ in target.calls)
+
+    def test_warm_up_stops_on_connection_error(self):
+        """Тест: прогрев прекращается при первой ошибке соединения"""
+        target = StubTarget(status=0, memory=1)
+        generator = LoadGenerator(
+            target, rate=100, duration=0.1, mix=parse_mix("POST=1")
+        )
+
+        generator.run()
+
+        assert [call for call in target.calls if call[0] == "GET"] == [
+            ("GET", "/users/1")
+        ]
+
+    def test_http_error_status(self, server):
+        """Тест получения 4xx статуса от сервера"""
+        assert HttpTarget(server).request("GET", "/users/999") == (404, None)
+
+    def test_http_keep_alive(self, keep_alive_server):
+        """Тест повторного использования соединения в потоке"""
+        target = HttpTarget(keep_alive_server)
+
+        for _ in range(3):
+            assert target.request("GET", "/health") == (200, {"status": "healthy"})
+
+        assert KeepAliveHandler.connections == 1
+
+    def test_http_reconnect(self, keep_alive_server):
+        """Тест переподключения после закрытия соединения"""
+        target = HttpTarget(keep_alive_server)
+        target.request("GET", "/health")
+        target._local.connection.sock.close()
+
+        assert target.request("GET", "/health") == (200, {"status": "healthy"})
+        assert KeepAliveHandler.connections == 2
+
+    def test_http_connection_close(self, server):
+        """Тест: соединение закрывается, если сервер этого требует"""
+        target = HttpTarget(server)
+
+        assert target.request("GET", "/health")[0] == 200
+        assert target._local.connection is None
+
+    def test_http_protocol_error(self, server, monkeypatch):
+        """Тест обрыва ответа сервера"""
+
+        def broken_getresponse(connection):
+            raise http.client.IncompleteRead(b"")
+
+        monkeypatch.setattr(
+            http.client.HTTPConnection, "getresponse", broken_getresponse
+        )
+        assert HttpTarget(server).request("GET", "/health") == (0, None)
+
+    def test_http_memory_without_pid(self):
+        """Тест: без PID память сервера не отслеживается"""
+        assert HttpTarget("http://127.0.0.1:1").memory_bytes() is None
+
+    def test_http_connection_error(self):
+        """Тест ошибки соединения"""
+        target = HttpTarget("http://127.0.0.1:1", timeout=1)
+        assert target.request("GET", "/health") == (0, None)
+
+
+class TestCli:
+    """Тесты для CLI"""
+
+    def test_main_json(self, clean_repository, capsys):
+        """Тест запуска с выводом JSON"""
+        code = main(
+            ["--users", "5", "--rate", "50", "--duration", "0.2", "--json"]
+            + ["--interval", "0.1"]
+        )
+
+        assert code == 0
+        report = json.loads(capsys.readouterr().out)
+        assert report["seeded_users"] == 5
+        assert report["memory_tracing"] is False
+        assert report["memory_growth_bytes"] is None
+
+    def test_main_memory(self, clean_repository, capsys):
+        """Тест запуска с отслеживанием памяти"""
+        code = main(
+            ["--rate", "50", "--duration", "0.2", "--interval", "0.1"]
+            + ["--mix", "POST=1", "--memory", "--json"]
+        )
+
+        assert code == 0
+        report = json.loads(capsys.readouterr().out)
+        assert report["memory_tracing"] is True
+        assert report["memory_growth_bytes"] is not None
+        assert not tracemalloc.is_tracing()
+
+    def test_main_pid_requires_url(self, clean_repository):
+        """Тест: --pid без --url отклоняется"""
+        with pytest.raises(SystemExit):
+            main(["--pid", "1"])
+
+    def test_main_invalid_mix(self, clean_repository):
+        """Тест запуска с некорректной смесью"""
+        with pytest.raises(SystemExit):
+            main(["--mix", "PATCH=1"])
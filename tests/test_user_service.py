@@ -108,6 +108,20 @@ class TestUserRepository:
         user = repository.find_by_email("nonexistent@example.com")
         assert user is None
 
+    def test_find_by_email_after_update_and_delete(self, repository):
+        """Тест поиска по email после обновления и удаления"""
+        user = repository.create(username="test", email="old@example.com")
+
+        repository.update(user_id=user.user_id, email="new@example.com")
+        assert repository.find_by_email("old@example.com") is None
+        assert repository.find_by_email("new@example.com").user_id == user.user_id
+
+        repository.delete(user.user_id)
+        assert repository.find_by_email("new@example.com") is None
+
+        # Освободившийся email снова доступен
+        repository.create(username="test", email="new@example.com")
+
     def test_get_all(self, repository):
         """Тест получения всех пользователей"""
         repository.create(username="user1", email="user1@example.com")
@@ -165,3 +179,44 @@ class TestUserRepository:
 
         repository.create(username="user2", email="user2@example.com")
         assert repository.count() == 2
+
+    def test_stats_empty(self, repository):
+        """Тест статистики пустого репозитория"""
+        stats = repository.stats()
+
+        assert stats["total"] == 0
+        assert stats["by_email_domain"] == {}
+        assert stats["created_per_day"] == {}
+
+    def test_stats_tracks_create_update_delete(self, repository):
+        """Тест инкрементального обновления статистики"""
+        user1 = repository.create(username="user1", email="user1@example.com")
+        repository.create(username="user2", email="user2@Example.com")
+        repository.create(username="user3", email="user3@test.org")
+        today = user1.created_at.date().isoformat()
+
+        stats = repository.stats()
+        assert stats["total"] == 3
+        assert stats["by_email_domain"] == {"example.com": 2, "test.org": 1}
+        assert stats["created_per_day"] == {today: 3}
+
+        repository.update(user_id=user1.user_id, email="user1@test.org")
+        stats = repository.stats()
+        assert stats["by_email_domain"] == {"example.com": 1, "test.org": 2}
+        assert stats["created_per_day"] == {today: 3}
+
+        repository.delete(user1.user_id)
+        stats = repository.stats()
+        assert stats["total"] == 2
+        assert stats["by_email_domain"] == {"example.com": 1, "test.org": 1}
+        assert stats["created_per_day"] == {today: 2}
+
+    def test_clear(self, repository):
+        """Тест очистки репозитория"""
+        repository.create(username="user1", email="user1@example.com")
+
+        repository.clear()
+
+        assert repository.count() == 0
+        assert repository.stats()["by_email_domain"] == {}
+        assert repository.create(username="user2", email="u2@example.com").user_id == 1